@@ -5,19 +5,132 @@ Discovers and categorizes AWS resources by application ownership using tags.
 """
 
 import boto3
+from botocore.config import Config
 import json
 import csv
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import chain
 import argparse
 import logging
+import queue
+import re
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Resource types whose tags are bulk-fetched via the Resource Groups Tagging API
+TAG_PREFETCH_RESOURCE_TYPES = [
+    'lambda:function', 'rds:db', 'rds:cluster', 'dynamodb:table',
+    'apigateway:restapis', 'apigateway:apis'
+]
+
+# Fast mode discovers resources from the Tagging API, so it also needs the types whose
+# tags the detailed path reads from the describe calls themselves. S3 is left out: the
+# Tagging API is regional, but buckets of every region are listed by inventory_s3_buckets.
+FAST_MODE_RESOURCE_TYPES = TAG_PREFETCH_RESOURCE_TYPES + ['ec2:instance']
+
+# (ARN service, ARN resource type) -> (service, resource_type) labels used in the reports
+ARN_RESOURCE_LABELS = {
+    ('lambda', 'function'): ('Lambda', 'Function'),
+    ('rds', 'db'): ('RDS', 'DB Instance'),
+    ('rds', 'cluster'): ('RDS', 'DB Cluster'),
+    ('dynamodb', 'table'): ('DynamoDB', 'Table'),
+    ('ec2', 'instance'): ('EC2', 'Instance'),
+    ('apigateway', 'restapis'): ('API Gateway', 'REST API'),
+    ('apigateway', 'apis'): ('API Gateway v2', 'HTTP API'),
+}
+
+# Resource fields that get their own CSV columns instead of going into 'Additional Info'
+CSV_COLUMN_FIELDS = frozenset(['service', 'resource_type', 'name', 'arn', 'app_name', 'tags'])
+
+def _json_default(obj):
+    """Encode values JSON cannot represent; dates and times use ISO 8601, as orjson does natively"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+# Compact JSON encoder, built once and reused; non-ASCII stays raw UTF-8 to match orjson
+_json_encode = json.JSONEncoder(default=_json_default, separators=(',', ':'), ensure_ascii=False).encode
+
+def to_json(obj):
+    """Serialize an object to a compact JSON string, using orjson when available
+    
+    Both paths produce the same output, so reports do not depend on which packages are installed.
+    """
+    if orjson:
+        return orjson.dumps(obj, default=_json_default).decode()
+    return _json_encode(obj)
+
+# Marks the end of the pages handed over by _prefetch_pages
+_END_OF_PAGES = object()
+
+# Directory for the opt-in on-disk cache of AWS API responses
+API_CACHE_DIR = './.aws_inv_cache'
+
+# Client methods with these prefixes only read state, so their responses can be cached
+CACHEABLE_OPERATION_PREFIXES = ('describe_', 'list_', 'get_', 'head_')
+
+class CachedClient:
+    """Proxy for a boto3 client that serves read-only calls from a disk cache"""
+
+    def __init__(self, client, cache, key_prefix, ttl):
+        self._client = client
+        self._cache = cache
+        self._key_prefix = key_prefix
+        self._ttl = ttl
+
+    def cached_call(self, operation_name, kwargs, fetch):
+        """Return the cached result for (operation, kwargs), calling fetch() on a miss"""
+        key = json.dumps([self._key_prefix, operation_name, kwargs], sort_keys=True, default=str)
+        result = self._cache.get(key)
+        if result is None:
+            result = fetch()
+            self._cache.set(key, result, expire=self._ttl)
+        return result
+
+    def get_paginator(self, operation_name):
+        return CachedPaginator(self, self._client.get_paginator(operation_name), operation_name)
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name == 'get_waiter' or not (callable(attr) and name.startswith(CACHEABLE_OPERATION_PREFIXES)):
+            return attr
+        
+        def cached_operation(**kwargs):
+            return self.cached_call(name, kwargs, lambda: attr(**kwargs))
+        return cached_operation
+
+class CachedPaginator:
+    """Wrapper for a boto3 paginator that caches all pages of a paginate() call together"""
+
+    def __init__(self, cached_client, paginator, operation_name):
+        self._cached_client = cached_client
+        self._paginator = paginator
+        self._operation_name = operation_name
+
+    def paginate(self, **kwargs):
+        pages = self._cached_client.cached_call(
+            f"paginate:{self._operation_name}", kwargs, lambda: list(self._paginator.paginate(**kwargs))
+        )
+        return iter(pages)
+
 class AWSResourceInventory:
-    def __init__(self, region='us-east-1', profile=None):
+    def __init__(self, region='us-east-1', profile=None, cache_ttl=0, include_details=True):
         """Initialize AWS session and clients"""
         try:
             if profile:
@@ -30,8 +143,38 @@ class AWSResourceInventory:
             self.clients = {}
             self.inventory = defaultdict(list)
             
+            # Per-application resource counts, kept up to date as resources are added
+            self.summary_counts = defaultdict(Counter)
+            self.totals = Counter()
+            self.tag_cache = {}
+            # Set once a tag prefetch completes; standalone inventory_* calls run without one
+            self.tag_cache_loaded = False
+            
+            # Whether to make per-resource describe calls that only add metadata (e.g. DynamoDB item counts)
+            self.include_details = include_details
+            self._lock = threading.Lock()
+            
+            # Shared client config: a connection pool large enough for the worker threads,
+            # kept-alive connections across pages, and adaptive retries so throttling backs off
+            self._boto_config = Config(
+                max_pool_connections=64,
+                retries={'max_attempts': 10, 'mode': 'adaptive'},
+                tcp_keepalive=True
+            )
+            
             # Tag keys to check for application ownership (customize these)
-            self.app_tag_keys = ['Application', 'App', 'application', 'app', 'Project', 'project']
+            self.app_tag_keys = frozenset(['Application', 'App', 'application', 'app', 'Project', 'project'])
+            
+            # Optional disk cache for read-only API responses (cache_ttl in seconds, 0 disables)
+            self.account_id = None
+            self.cache_ttl = cache_ttl
+            self.cache = None
+            if cache_ttl > 0:
+                if diskcache:
+                    self.cache = diskcache.Cache(API_CACHE_DIR)
+                    self.get_account_id()
+                else:
+                    logger.warning("diskcache is not installed; API response caching is disabled")
             
         except Exception as e:
             logger.error(f"Failed to initialize AWS session: {e}")
@@ -39,79 +182,188 @@ class AWSResourceInventory:
 
     def get_client(self, service):
         """Get or create boto3 client for a service"""
-        if service not in self.clients:
-            self.clients[service] = self.session.client(service, region_name=self.region)
-        return self.clients[service]
+        with self._lock:
+            if service not in self.clients:
+                client = self.session.client(service, region_name=self.region, config=self._boto_config)
+                if self.cache is not None:
+                    client = CachedClient(client, self.cache, [self.account_id, self.region, service],
+                                          self.cache_ttl)
+                self.clients[service] = client
+            return self.clients[service]
+
+    def get_account_id(self):
+        """Get (and remember) the AWS account id of the current credentials"""
+        if self.account_id is None:
+            # The session is shared with get_client and is not thread-safe; only the STS call runs unlocked
+            with self._lock:
+                sts_client = self.session.client('sts', region_name=self.region, config=self._boto_config)
+            self.account_id = sts_client.get_caller_identity()['Account']
+        return self.account_id
+
+    def _map_concurrently(self, fn, items, max_workers=20):
+        """Apply fn to each item on a thread pool, dropping items it could not process (None)"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return [result for result in executor.map(fn, items) if result is not None]
+
+    def _iter_pages_by_token(self, operation, **kwargs):
+        """Yield response pages of a NextToken-paginated operation without a boto3 paginator"""
+        response = operation(**kwargs)
+        while response:
+            yield response
+            next_token = response.get('NextToken')
+            response = operation(NextToken=next_token, **kwargs) if next_token else None
+
+    def _prefetch_pages(self, pages, max_prefetch=2):
+        """Yield pages while the following ones are fetched on a background thread"""
+        page_queue = queue.Queue(maxsize=max_prefetch)
+        stopped = threading.Event()
+        errors = []
+        
+        def put(item):
+            # Keep retrying while the queue is full, but give up once the consumer has stopped
+            while not stopped.is_set():
+                try:
+                    page_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def fetch_pages():
+            try:
+                for page in pages:
+                    if not put(page):
+                        return
+            except Exception as e:
+                errors.append(e)
+            put(_END_OF_PAGES)
+        
+        threading.Thread(target=fetch_pages, daemon=True).start()
+        try:
+            yield from iter(page_queue.get, _END_OF_PAGES)
+        finally:
+            stopped.set()
+        if errors:
+            raise errors[0]
+
+    def _prefetch_tags_by_arn(self, resource_type_filters):
+        """Bulk-fetch tags for all resources of the given types into self.tag_cache, keyed by ARN
+        
+        Errors are re-raised: without the cache every resource would silently be filed as untagged.
+        """
+        logger.info("Prefetching resource tags...")
+        try:
+            tagging_client = self.get_client('resourcegroupstaggingapi')
+            paginator = tagging_client.get_paginator('get_resources')
+            
+            for page in paginator.paginate(ResourceTypeFilters=resource_type_filters,
+                                           PaginationConfig={'PageSize': 100}):
+                for mapping in page['ResourceTagMappingList']:
+                    self.tag_cache[mapping['ResourceARN']] = mapping.get('Tags', [])
+            
+            self.tag_cache_loaded = True
+                    
+        except Exception as e:
+            logger.error(f"Error prefetching resource tags: {e}")
+            raise
+
+    def parse_arn(self, arn):
+        """Split an ARN into (service, resource_type, name)"""
+        _, _, service, _, _, resource = arn.split(':', 5)
+        
+        # Resource part is "type/name", "type:name" or "/type/id" (API Gateway); S3 has only the name
+        resource_parts = re.split(r'[:/]', resource.lstrip('/'), maxsplit=1)
+        if len(resource_parts) == 1:
+            return service, '', resource_parts[0]
+        return service, resource_parts[0], resource_parts[1]
 
     def extract_app_name(self, tags):
-        """Extract application name from resource tags"""
+        """Extract application name from resource tags (a list of Key/Value dicts or a {key: value} dict)"""
         if not tags:
             return 'untagged'
         
+        if isinstance(tags, dict):
+            for key, value in tags.items():
+                if key in self.app_tag_keys and value:
+                    return value.lower().replace(' ', '-')
+            return 'untagged'
+        
         for tag in tags:
-            if isinstance(tag, dict):
-                key = tag.get('Key', '')
-                value = tag.get('Value', '')
-            else:
-                # Handle different tag formats
-                continue
-                
-            if key in self.app_tag_keys and value:
-                return value.lower().replace(' ', '-')
+            # Skip tags in other formats
+            if isinstance(tag, dict) and tag.get('Key') in self.app_tag_keys and tag.get('Value'):
+                return tag['Value'].lower().replace(' ', '-')
         
         return 'untagged'
 
     def inventory_lambda_functions(self):
         """Inventory Lambda functions"""
         logger.info("Inventorying Lambda functions...")
+        results = []
         try:
             lambda_client = self.get_client('lambda')
             paginator = lambda_client.get_paginator('list_functions')
             
-            for page in paginator.paginate():
-                for func in page['Functions']:
-                    try:
-                        # Get function tags
-                        tags_response = lambda_client.list_tags(Resource=func['FunctionArn'])
-                        tags = [{'Key': k, 'Value': v} for k, v in tags_response.get('Tags', {}).items()]
-                        
-                        app_name = self.extract_app_name(tags)
-                        
-                        resource_info = {
-                            'service': 'Lambda',
-                            'resource_type': 'Function',
-                            'name': func['FunctionName'],
-                            'arn': func['FunctionArn'],
-                            'app_name': app_name,
-                            'runtime': func.get('Runtime', 'Unknown'),
-                            'memory': func.get('MemorySize', 0),
-                            'timeout': func.get('Timeout', 0),
-                            'last_modified': func.get('LastModified', ''),
-                            'tags': tags
-                        }
-                        
-                        self.inventory[app_name].append(resource_info)
-                        
-                    except Exception as e:
-                        logger.warning(f"Error processing Lambda function {func['FunctionName']}: {e}")
+            # ListFunctions returns at most 50 functions per page regardless of MaxItems
+            functions = [func for page in paginator.paginate(PaginationConfig={'PageSize': 50})
+                         for func in page['Functions']]
+            
+            if self.tag_cache_loaded:
+                function_tags = [self.tag_cache.get(func['FunctionArn'], []) for func in functions]
+            else:
+                # Only reached when called outside run_inventory, which always prefetches tags
+                # (and fails if that prefetch fails): fetch them in one concurrent batch
+                with ThreadPoolExecutor(max_workers=20) as executor:
+                    function_tags = list(executor.map(self._get_lambda_tags, functions))
+            
+            for func, tags in zip(functions, function_tags):
+                try:
+                    app_name = self.extract_app_name(tags)
+                    
+                    resource_info = {
+                        'service': 'Lambda',
+                        'resource_type': 'Function',
+                        'name': func['FunctionName'],
+                        'arn': func['FunctionArn'],
+                        'app_name': app_name,
+                        'runtime': func.get('Runtime', 'Unknown'),
+                        'memory': func.get('MemorySize', 0),
+                        'timeout': func.get('Timeout', 0),
+                        'last_modified': func.get('LastModified', ''),
+                        'tags': tags
+                    }
+                    
+                    results.append(resource_info)
+                    
+                except Exception as e:
+                    logger.warning(f"Error processing Lambda function {func['FunctionName']}: {e}")
                         
         except Exception as e:
             logger.error(f"Error inventorying Lambda functions: {e}")
+        
+        return results
+
+    def _get_lambda_tags(self, func):
+        """Fetch the tags of a single Lambda function"""
+        try:
+            tags_response = self.get_client('lambda').list_tags(Resource=func['FunctionArn'])
+            return tags_response.get('Tags', {})
+        except Exception as e:
+            logger.warning(f"Error getting tags for Lambda function {func['FunctionName']}: {e}")
+            return {}
 
     def inventory_rds_instances(self):
         """Inventory RDS instances and clusters"""
         logger.info("Inventorying RDS instances...")
+        results = []
         try:
             rds_client = self.get_client('rds')
             
             # RDS Instances
             paginator = rds_client.get_paginator('describe_db_instances')
-            for page in paginator.paginate():
+            for page in self._prefetch_pages(paginator.paginate(PaginationConfig={'PageSize': 100})):
                 for db in page['DBInstances']:
                     try:
-                        # Get DB tags
-                        tags_response = rds_client.list_tags_for_resource(ResourceName=db['DBInstanceArn'])
-                        tags = tags_response.get('TagList', [])
+                        tags = self.tag_cache.get(db['DBInstanceArn'], [])
                         
                         app_name = self.extract_app_name(tags)
                         
@@ -128,18 +380,17 @@ class AWSResourceInventory:
                             'tags': tags
                         }
                         
-                        self.inventory[app_name].append(resource_info)
+                        results.append(resource_info)
                         
                     except Exception as e:
                         logger.warning(f"Error processing RDS instance {db['DBInstanceIdentifier']}: {e}")
             
             # RDS Clusters
             paginator = rds_client.get_paginator('describe_db_clusters')
-            for page in paginator.paginate():
+            for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
                 for cluster in page['DBClusters']:
                     try:
-                        tags_response = rds_client.list_tags_for_resource(ResourceName=cluster['DBClusterArn'])
-                        tags = tags_response.get('TagList', [])
+                        tags = self.tag_cache.get(cluster['DBClusterArn'], [])
                         
                         app_name = self.extract_app_name(tags)
                         
@@ -154,113 +405,159 @@ class AWSResourceInventory:
                             'tags': tags
                         }
                         
-                        self.inventory[app_name].append(resource_info)
+                        results.append(resource_info)
                         
                     except Exception as e:
                         logger.warning(f"Error processing RDS cluster {cluster['DBClusterIdentifier']}: {e}")
                         
         except Exception as e:
             logger.error(f"Error inventorying RDS resources: {e}")
+        
+        return results
 
     def inventory_dynamodb_tables(self):
         """Inventory DynamoDB tables"""
         logger.info("Inventorying DynamoDB tables...")
+        results = []
         try:
             dynamodb_client = self.get_client('dynamodb')
             paginator = dynamodb_client.get_paginator('list_tables')
             
-            for page in paginator.paginate():
-                for table_name in page['TableNames']:
-                    try:
-                        # Get table details
-                        table_response = dynamodb_client.describe_table(TableName=table_name)
-                        table = table_response['Table']
-                        
-                        # Get table tags
-                        tags_response = dynamodb_client.list_tags_of_resource(ResourceArn=table['TableArn'])
-                        tags = tags_response.get('Tags', [])
-                        
-                        app_name = self.extract_app_name(tags)
-                        
-                        resource_info = {
-                            'service': 'DynamoDB',
-                            'resource_type': 'Table',
-                            'name': table_name,
-                            'arn': table['TableArn'],
-                            'app_name': app_name,
-                            'status': table.get('TableStatus', 'Unknown'),
-                            'item_count': table.get('ItemCount', 0),
-                            'table_size_bytes': table.get('TableSizeBytes', 0),
-                            'tags': tags
-                        }
-                        
-                        self.inventory[app_name].append(resource_info)
-                        
-                    except Exception as e:
-                        logger.warning(f"Error processing DynamoDB table {table_name}: {e}")
+            # Without details, ARNs are built locally; resolve the prefix once up front so that
+            # a failure here fails the whole method instead of every table
+            table_arn_prefix = None
+            if not self.include_details:
+                with self._lock:
+                    partition = self.session.get_partition_for_region(self.region)
+                table_arn_prefix = f"arn:{partition}:dynamodb:{self.region}:{self.get_account_id()}:table/"
+            inventory_one_table = partial(self._inventory_one_table, table_arn_prefix=table_arn_prefix)
+            
+            for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
+                results.extend(self._map_concurrently(inventory_one_table, page['TableNames']))
                         
         except Exception as e:
             logger.error(f"Error inventorying DynamoDB tables: {e}")
+        
+        return results
+
+    def _inventory_one_table(self, table_name, table_arn_prefix):
+        """Build the inventory record for a single DynamoDB table"""
+        try:
+            # Get table details; without them, build the ARN locally instead of calling describe_table
+            table = None
+            if self.include_details:
+                dynamodb_client = self.get_client('dynamodb')
+                table = dynamodb_client.describe_table(TableName=table_name)['Table']
+                table_arn = table['TableArn']
+            else:
+                table_arn = f"{table_arn_prefix}{table_name}"
+            
+            tags = self.tag_cache.get(table_arn, [])
+            
+            app_name = self.extract_app_name(tags)
+            
+            resource_info = {
+                'service': 'DynamoDB',
+                'resource_type': 'Table',
+                'name': table_name,
+                'arn': table_arn,
+                'app_name': app_name
+            }
+            
+            if table is not None:
+                resource_info.update({
+                    'status': table.get('TableStatus', 'Unknown'),
+                    'item_count': table.get('ItemCount', 0),
+                    'table_size_bytes': table.get('TableSizeBytes', 0)
+                })
+            
+            resource_info['tags'] = tags
+            return resource_info
+            
+        except Exception as e:
+            logger.warning(f"Error processing DynamoDB table {table_name}: {e}")
+            return None
 
     def inventory_s3_buckets(self):
         """Inventory S3 buckets"""
         logger.info("Inventorying S3 buckets...")
+        results = []
         try:
             s3_client = self.get_client('s3')
             response = s3_client.list_buckets()
             
-            for bucket in response['Buckets']:
-                try:
-                    bucket_name = bucket['Name']
-                    
-                    # Get bucket tags
-                    try:
-                        tags_response = s3_client.get_bucket_tagging(Bucket=bucket_name)
-                        tags = tags_response.get('TagSet', [])
-                    except s3_client.exceptions.ClientError as e:
-                        if e.response['Error']['Code'] == 'NoSuchTagSet':
-                            tags = []
-                        else:
-                            raise
-                    
-                    app_name = self.extract_app_name(tags)
-                    
-                    # Get bucket location
-                    try:
-                        location_response = s3_client.get_bucket_location(Bucket=bucket_name)
-                        location = location_response.get('LocationConstraint', 'us-east-1')
-                        if location is None:
-                            location = 'us-east-1'
-                    except:
-                        location = 'Unknown'
-                    
-                    resource_info = {
-                        'service': 'S3',
-                        'resource_type': 'Bucket',
-                        'name': bucket_name,
-                        'arn': f"arn:aws:s3:::{bucket_name}",
-                        'app_name': app_name,
-                        'creation_date': bucket['CreationDate'].isoformat(),
-                        'region': location,
-                        'tags': tags
-                    }
-                    
-                    self.inventory[app_name].append(resource_info)
-                    
-                except Exception as e:
-                    logger.warning(f"Error processing S3 bucket {bucket_name}: {e}")
+            results.extend(self._map_concurrently(self._inventory_one_bucket, response['Buckets'],
+                                                  max_workers=32))
                     
         except Exception as e:
             logger.error(f"Error inventorying S3 buckets: {e}")
+        
+        return results
+
+    def _inventory_one_bucket(self, bucket):
+        """Build the inventory record for a single S3 bucket"""
+        bucket_name = bucket['Name']
+        try:
+            s3_client = self.get_client('s3')
+            
+            # Get bucket tags
+            try:
+                tags_response = s3_client.get_bucket_tagging(Bucket=bucket_name)
+                tags = tags_response.get('TagSet', [])
+            except s3_client.exceptions.ClientError as e:
+                if e.response['Error']['Code'] == 'NoSuchTagSet':
+                    tags = []
+                else:
+                    raise
+            
+            app_name = self.extract_app_name(tags)
+            
+            # Get bucket location
+            try:
+                location = self._get_bucket_region(s3_client, bucket_name)
+            except:
+                location = 'Unknown'
+            
+            return {
+                'service': 'S3',
+                'resource_type': 'Bucket',
+                'name': bucket_name,
+                'arn': f"arn:aws:s3:::{bucket_name}",
+                'app_name': app_name,
+                'creation_date': bucket['CreationDate'].isoformat(),
+                'region': location,
+                'tags': tags
+            }
+            
+        except Exception as e:
+            logger.warning(f"Error processing S3 bucket {bucket_name}: {e}")
+            return None
+
+    def _get_bucket_region(self, s3_client, bucket_name):
+        """Get a bucket's region from the HeadBucket region header, falling back to GetBucketLocation"""
+        try:
+            response = s3_client.head_bucket(Bucket=bucket_name)
+        except s3_client.exceptions.ClientError as e:
+            # Error responses (e.g. 403 for a bucket we cannot read) still carry the header
+            response = e.response
+        
+        location = response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('x-amz-bucket-region')
+        if location:
+            return location
+        
+        location_response = s3_client.get_bucket_location(Bucket=bucket_name)
+        return location_response.get('LocationConstraint') or 'us-east-1'
 
     def inventory_ec2_instances(self):
         """Inventory EC2 instances"""
         logger.info("Inventorying EC2 instances...")
+        results = []
         try:
             ec2_client = self.get_client('ec2')
-            paginator = ec2_client.get_paginator('describe_instances')
             
-            for page in paginator.paginate():
+            # Follow NextToken by hand; the boto3 paginator gets very slow on large EC2 result sets
+            pages = self._iter_pages_by_token(ec2_client.describe_instances, MaxResults=1000)
+            for page in self._prefetch_pages(pages):
                 for reservation in page['Reservations']:
                     for instance in reservation['Instances']:
                         try:
@@ -279,28 +576,30 @@ class AWSResourceInventory:
                                 'tags': tags
                             }
                             
-                            self.inventory[app_name].append(resource_info)
+                            results.append(resource_info)
                             
                         except Exception as e:
                             logger.warning(f"Error processing EC2 instance {instance.get('InstanceId', 'unknown')}: {e}")
                             
         except Exception as e:
             logger.error(f"Error inventorying EC2 instances: {e}")
+        
+        return results
 
     def inventory_apigateway_apis(self):
         """Inventory API Gateway APIs"""
         logger.info("Inventorying API Gateway APIs...")
+        results = []
         try:
             # REST APIs
             apigw_client = self.get_client('apigateway')
             paginator = apigw_client.get_paginator('get_rest_apis')
             
-            for page in paginator.paginate():
+            for page in paginator.paginate(PaginationConfig={'PageSize': 500}):
                 for api in page['items']:
                     try:
-                        # Get API tags
-                        tags_response = apigw_client.get_tags(resourceArn=f"arn:aws:apigateway:{self.region}::/restapis/{api['id']}")
-                        tags = [{'Key': k, 'Value': v} for k, v in tags_response.get('tags', {}).items()]
+                        api_arn = f"arn:aws:apigateway:{self.region}::/restapis/{api['id']}"
+                        tags = self.tag_cache.get(api_arn, [])
                         
                         app_name = self.extract_app_name(tags)
                         
@@ -308,14 +607,14 @@ class AWSResourceInventory:
                             'service': 'API Gateway',
                             'resource_type': 'REST API',
                             'name': api['name'],
-                            'arn': f"arn:aws:apigateway:{self.region}::/restapis/{api['id']}",
+                            'arn': api_arn,
                             'app_name': app_name,
                             'api_id': api['id'],
                             'created_date': api.get('createdDate', '').isoformat() if api.get('createdDate') else '',
                             'tags': tags
                         }
                         
-                        self.inventory[app_name].append(resource_info)
+                        results.append(resource_info)
                         
                     except Exception as e:
                         logger.warning(f"Error processing API Gateway API {api.get('name', 'unknown')}: {e}")
@@ -324,10 +623,12 @@ class AWSResourceInventory:
             apigwv2_client = self.get_client('apigatewayv2')
             paginator = apigwv2_client.get_paginator('get_apis')
             
-            for page in paginator.paginate():
+            # The v2 API models MaxResults as a string
+            for page in paginator.paginate(PaginationConfig={'PageSize': '500'}):
                 for api in page['Items']:
                     try:
-                        app_name = self.extract_app_name(api.get('Tags', {}))
+                        tags = api.get('Tags', {})
+                        app_name = self.extract_app_name(tags)
                         
                         resource_info = {
                             'service': 'API Gateway v2',
@@ -338,28 +639,95 @@ class AWSResourceInventory:
                             'api_id': api['ApiId'],
                             'protocol_type': api.get('ProtocolType', 'Unknown'),
                             'created_date': api.get('CreatedDate', '').isoformat() if api.get('CreatedDate') else '',
-                            'tags': [{'Key': k, 'Value': v} for k, v in api.get('Tags', {}).items()]
+                            'tags': tags
                         }
                         
-                        self.inventory[app_name].append(resource_info)
+                        results.append(resource_info)
                         
                     except Exception as e:
                         logger.warning(f"Error processing API Gateway v2 API {api.get('Name', 'unknown')}: {e}")
                         
         except Exception as e:
             logger.error(f"Error inventorying API Gateway APIs: {e}")
+        
+        return results
+
+    def inventory_tagged_resources(self):
+        """Inventory resources straight from the prefetched tag cache, without describe calls"""
+        logger.info("Inventorying resources from tags...")
+        results = []
+        for arn, tags in self.tag_cache.items():
+            try:
+                arn_service, arn_resource_type, name = self.parse_arn(arn)
+                service, resource_type = ARN_RESOURCE_LABELS.get(
+                    (arn_service, arn_resource_type), (arn_service, arn_resource_type)
+                )
+                
+                resource_info = {
+                    'service': service,
+                    'resource_type': resource_type,
+                    'name': name,
+                    'arn': arn,
+                    'app_name': self.extract_app_name(tags),
+                    'tags': tags
+                }
+                
+                results.append(resource_info)
+                
+            except Exception as e:
+                logger.warning(f"Error processing tagged resource {arn}: {e}")
+        
+        return results
 
-    def run_inventory(self):
-        """Run complete inventory of AWS resources"""
+    def run_inventory(self, fast_mode=True):
+        """Run complete inventory of AWS resources
+        
+        In fast mode resources are discovered from the Resource Groups Tagging API, which
+        only returns resources that carry (or once carried) tags and no per-service metadata.
+        S3 buckets are still listed for all regions via inventory_s3_buckets. Pass
+        fast_mode=False to describe every resource of each service.
+        
+        Tagging API errors are raised rather than returning an empty inventory.
+        """
         logger.info(f"Starting AWS resource inventory for region: {self.region}")
         
-        # Run inventory for each service
-        self.inventory_lambda_functions()
-        self.inventory_rds_instances()
-        self.inventory_dynamodb_tables()
-        self.inventory_s3_buckets()
-        self.inventory_ec2_instances()
-        self.inventory_apigateway_apis()
+        if fast_mode:
+            # Buckets are listed globally while the regional Tagging API walk runs
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                s3_future = executor.submit(self.inventory_s3_buckets)
+                
+                # The Tagging API is the only source for the other services, so its errors must reach the caller
+                self._prefetch_tags_by_arn(FAST_MODE_RESOURCE_TYPES)
+                if not self.tag_cache:
+                    logger.warning("Tagging API returned no resources; use --details to include untagged resources")
+                all_results = [self.inventory_tagged_resources(), s3_future.result()]
+        else:
+            # Fetch tags for all services in one paginated stream instead of one call per resource
+            self._prefetch_tags_by_arn(TAG_PREFETCH_RESOURCE_TYPES)
+            
+            # Run inventory for each service concurrently; the calls are I/O-bound and independent
+            inventory_methods = [
+                self.inventory_lambda_functions,
+                self.inventory_rds_instances,
+                self.inventory_dynamodb_tables,
+                self.inventory_s3_buckets,
+                self.inventory_ec2_instances,
+                self.inventory_apigateway_apis
+            ]
+            with ThreadPoolExecutor(max_workers=len(inventory_methods)) as executor:
+                futures = [executor.submit(method) for method in inventory_methods]
+                all_results = [future.result() for future in futures]
+        
+        # Group by application on this thread, so workers never share self.inventory
+        for resource_info in chain.from_iterable(all_results):
+            # Some APIs return tags as a {key: value} dict; store every record in Key/Value list form
+            if isinstance(resource_info['tags'], dict):
+                resource_info['tags'] = [{'Key': k, 'Value': v} for k, v in resource_info['tags'].items()]
+            
+            app_name = resource_info['app_name']
+            self.inventory[app_name].append(resource_info)
+            self.summary_counts[app_name][resource_info['service']] += 1
+            self.totals[app_name] += 1
         
         logger.info("Inventory complete!")
         return dict(self.inventory)
@@ -370,27 +738,26 @@ class AWSResourceInventory:
         
         # JSON Report
         json_file = f"{output_dir}/aws_inventory_{timestamp}.json"
-        with open(json_file, 'w') as f:
-            json.dump(dict(self.inventory), f, indent=2, default=str)
+        with open(json_file, 'w', encoding='utf-8') as f:
+            f.write(to_json(dict(self.inventory)))
         logger.info(f"JSON report saved to: {json_file}")
         
         # CSV Report
         csv_file = f"{output_dir}/aws_inventory_{timestamp}.csv"
-        with open(csv_file, 'w', newline='') as f:
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(['App Name', 'Service', 'Resource Type', 'Resource Name', 'ARN', 'Additional Info'])
             
             for app_name, resources in self.inventory.items():
                 for resource in resources:
-                    additional_info = {k: v for k, v in resource.items() 
-                                     if k not in ['service', 'resource_type', 'name', 'arn', 'app_name', 'tags']}
+                    additional_info = {k: v for k, v in resource.items() if k not in CSV_COLUMN_FIELDS}
                     writer.writerow([
                         app_name,
                         resource['service'],
                         resource['resource_type'],
                         resource['name'],
                         resource['arn'],
-                        json.dumps(additional_info, default=str)
+                        to_json(additional_info)
                     ])
         logger.info(f"CSV report saved to: {csv_file}")
         
@@ -400,21 +767,15 @@ class AWSResourceInventory:
             f.write("AWS Resource Inventory Summary\n")
             f.write("=" * 40 + "\n\n")
             
-            total_resources = 0
-            for app_name, resources in sorted(self.inventory.items()):
+            for app_name, service_counts in sorted(self.summary_counts.items()):
                 f.write(f"Application: {app_name}\n")
                 f.write("-" * 30 + "\n")
                 
-                service_counts = defaultdict(int)
-                for resource in resources:
-                    service_counts[resource['service']] += 1
-                    total_resources += 1
-                
                 for service, count in sorted(service_counts.items()):
                     f.write(f"  {service}: {count} resources\n")
-                f.write(f"  Total: {len(resources)} resources\n\n")
+                f.write(f"  Total: {self.totals[app_name]} resources\n\n")
             
-            f.write(f"OVERALL TOTAL: {total_resources} resources across {len(self.inventory)} applications\n")
+            f.write(f"OVERALL TOTAL: {sum(self.totals.values())} resources across {len(self.inventory)} applications\n")
         
         logger.info(f"Summary report saved to: {summary_file}")
         
@@ -429,15 +790,27 @@ def main():
     parser.add_argument('--region', default='us-east-1', help='AWS region to scan')
     parser.add_argument('--profile', help='AWS profile to use')
     parser.add_argument('--output-dir', default='./', help='Output directory for reports')
+    parser.add_argument('--details', action='store_true',
+                        help='Describe every resource per service (slower; includes untagged resources and '
+                             'service metadata instead of only tagged resources from the Tagging API; '
+                             'S3 buckets are listed in full either way)')
+    parser.add_argument('--tags-only', action='store_true',
+                        help='Requires --details; skip per-resource describe calls that only add metadata '
+                             '(e.g. DynamoDB item counts and sizes)')
+    parser.add_argument('--cache-ttl', type=int, default=0,
+                        help=f'Seconds to cache read-only AWS API responses in {API_CACHE_DIR} (0 disables)')
     
     args = parser.parse_args()
+    if args.tags_only and not args.details:
+        parser.error('--tags-only only applies together with --details')
     
     try:
         # Create inventory instance
-        inventory = AWSResourceInventory(region=args.region, profile=args.profile)
+        inventory = AWSResourceInventory(region=args.region, profile=args.profile, cache_ttl=args.cache_ttl,
+                                         include_details=not args.tags_only)
         
         # Run inventory
-        results = inventory.run_inventory()
+        results = inventory.run_inventory(fast_mode=not args.details)
         
         # Generate reports
         files = inventory.generate_reports(args.output_dir)